@@ -0,0 +1,138 @@
+import numpy as np
+
+
+# Turn x values (timestamps, numbers or labels) into floats for the area/bucket maths
+def numeric_x(x):
+    x = np.asarray(x)
+    if x.dtype.kind == 'M':
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    if x.dtype.kind in 'iuf':
+        return x.astype(np.float64)
+    return np.arange(len(x), dtype=np.float64)
+
+
+# Largest-Triangle-Three-Buckets: pick `threshold` indices that keep the visual shape of the series
+def lttb(x, y, threshold):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = numeric_x(x)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+
+        # Area of the triangle formed by the previous pick, each candidate and the next bucket's average
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+# Keep the lowest and highest point of each bucket so spikes and drawdowns survive
+def minmax(y, n_buckets):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    indices = np.empty(2 * n_buckets, dtype=np.int64)
+    for i in range(n_buckets):
+        bucket = y[edges[i]:edges[i + 1]]
+        indices[2 * i] = edges[i] + int(np.argmin(bucket))
+        indices[2 * i + 1] = edges[i] + int(np.argmax(bucket))
+    return np.unique(indices)
+
+
+# Reduce a series to about `n_points` indices, always keeping the indices flagged in `keep`
+# (e.g. bars with buy/sell signals) so markers still land on the plotted line.
+def downsample(x, y, n_points, keep=None, method='lttb'):
+    if method == 'lttb':
+        indices = lttb(x, y, n_points)
+    elif method == 'minmax':
+        indices = minmax(y, max(n_points // 2, 1))
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    if keep is not None:
+        keep = np.asarray(keep)
+        if keep.dtype == bool:
+            keep = np.flatnonzero(keep)
+        indices = np.union1d(indices, keep)
+    return indices
+
+
+# Width of the axes in pixels, i.e. the most points that can actually be told apart
+def axes_width(ax):
+    return max(int(ax.get_window_extent().width), 3)
+
+
+def plot_downsampled(ax, x, y, keep=None, method='lttb', **kwargs):
+    indices = downsample(x, y, axes_width(ax), keep=keep, method=method)
+    x = x.iloc[indices] if hasattr(x, 'iloc') else np.asarray(x)[indices]
+    y = y.iloc[indices] if hasattr(y, 'iloc') else np.asarray(y)[indices]
+    return ax.plot(x, y, **kwargs)
+
+
+# Incremental min/max downsampler for live charts. Each bucket of `bucket_size` points is
+# reduced to its min, its max and its first kept point as the points arrive. Once there are
+# more than `n_points // 2` buckets, neighbouring buckets are merged and the bucket size
+# doubles, so the chart holds at most about 1.5 * `n_points` points however long it runs.
+class LiveDownsampler:
+    def __init__(self, n_points):
+        self.n_points = max(n_points, 4)
+        self.bucket_size = 1
+        self.buckets = []
+        self.tail = []
+        self.tail_count = 0
+
+    def append(self, x, y, keep=False):
+        self.tail = reduce_bucket(self.tail + [(x, y, keep)])
+        self.tail_count += 1
+        if self.tail_count >= self.bucket_size:
+            self.buckets.append(self.tail)
+            self.tail = []
+            self.tail_count = 0
+            if len(self.buckets) > self.n_points // 2:
+                self.buckets = [reduce_bucket(self.buckets[i] + self.buckets[i + 1])
+                                for i in range(0, len(self.buckets) - 1, 2)] + \
+                               self.buckets[len(self.buckets) - len(self.buckets) % 2:]
+                self.bucket_size *= 2
+
+    def extend(self, xs, ys, keep=None):
+        if keep is None:
+            keep = [False] * len(xs)
+        for x, y, k in zip(xs, ys, keep):
+            self.append(x, y, k)
+
+    def points(self):
+        points = [point for bucket in self.buckets for point in bucket] + self.tail
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return xs, ys
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets) + len(self.tail)
+
+
+def reduce_bucket(points):
+    if len(points) <= 2:
+        return list(points)
+    low = min(range(len(points)), key=lambda i: points[i][1])
+    high = max(range(len(points)), key=lambda i: points[i][1])
+    # At most one kept point (e.g. a signal marker) survives per bucket, so markers are downsampled too
+    marker = next((i for i, point in enumerate(points) if point[2]), None)
+    return [point for i, point in enumerate(points) if i in (low, high, marker)]
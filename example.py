@@ -1,6 +1,12 @@
 import requests
 import pandas as pd
 import time
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+from indicator_cache import IndicatorCache
+from market_data import calculate_ema, extend_ema
+from signal_engine import evaluate_strategies, align
+from downsample import plot_downsampled
 
 # Replace with your Alpha Vantage API key
 API_KEY = 'YOUR_ALPHA_VANTAGE_API_KEY'
@@ -18,67 +24,36 @@ def parse_data(data):
     df = pd.DataFrame.from_dict(time_series, orient='index')
     df = df.astype(float)
     df = df.rename(columns={"4. close": "close"})
+    # Alpha Vantage returns the newest bar first; keep bars oldest first so new ones land at the tail
+    df = df.sort_index()
     return df
 
+# Add newly fetched bars to the bars seen so far. The feed is a sliding window, so keeping
+# the history makes the price series append-only (revised bars replace the old ones).
+def merge_data(history, latest):
+    merged = pd.concat([history, latest])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
 data = fetch_data(STOCK_SYMBOL, INTERVAL, API_KEY)
 stocks = parse_data(data)
 print(stocks.head())
 
 
-def calculate_sma(prices, period):
-    if len(prices) < period:
-        raise ValueError("Not enough data points to calculate SMA")
-    sma = sum(prices) / period
-    return [sma]
-
-def calculate_ema(prices, period):
-    if len(prices) < 2 * period:
-        raise ValueError("Prices length must be at least twice the period")
-    
-    emas = []
-    round_precision = detect_precision(prices[0])
-    
-    # First EMA value = SMA value
-    sma = calculate_sma(prices[:period], period)
-    previous_ema = sma[0]
-    emas.append(round_float(previous_ema, round_precision))
-    
-    # Smoothing factor
-    alpha = 2 / (1 + period)
-    for p in prices[period:]:
-        previous_ema = emas[-1]
-        ema = (p * alpha) + (previous_ema * (1 - alpha))
-        emas.append(round_float(ema, round_precision))
-    
-    return emas
+indicator_cache = IndicatorCache()
+cached_ema = indicator_cache.cached(calculate_ema, extend_ema)
 
 def generate_signals(prices, short_period, long_period):
-    short_ema = calculate_ema(prices, short_period)
-    long_ema = calculate_ema(prices, long_period)
-    
-    signals = []
-    
-    for i in range(len(long_ema)):
-        if i == 0:
-            signals.append(0)  # No signal on the first day
-        else:
-            if short_ema[i] > long_ema[i] and short_ema[i-1] <= long_ema[i-1]:
-                signals.append(1)  # Buy signal
-            elif short_ema[i] < long_ema[i] and short_ema[i-1] >= long_ema[i-1]:
-                signals.append(-1)  # Sell signal
-            else:
-                signals.append(0)  # No signal
-    
-    return signals
-
-def detect_precision(value):
-    if isinstance(value, float):
-        decimal_part = str(value).split('.')[1]
-        return len(decimal_part)
-    return 0
-
-def round_float(value, precision):
-    return round(value, precision)
+    long_ema = cached_ema(prices, long_period)
+    strategies = [
+        {'id': 'ema_cross', 'rule': 'crossover', 'fast': ('ema', short_period), 'slow': ('ema', long_period)},
+    ]
+
+    # Both EMAs end on the last bar, so compare them over the bars the long EMA covers
+    # 1 = buy, -1 = sell, 0 = no signal (never a signal on the first day)
+    _, matrix = evaluate_strategies(strategies, len(long_ema), lambda name, period: cached_ema(prices, period))
+
+    return matrix[0]
 
 # Get closing prices
 prices = stocks['close'].to_numpy()
@@ -88,10 +63,11 @@ long_period = 26
 # Generate signals
 signals = generate_signals(prices, short_period, long_period)
 
-# Append signals to the DataFrame
-stocks['short_ema'] = calculate_ema(prices, short_period)[len(prices) - len(signals):]
-stocks['long_ema'] = calculate_ema(prices, long_period)
-stocks['signal'] = signals
+# Append signals to the DataFrame; the EMAs and signals end on the last bar, so right-align them
+# (no EMA before the first full period, no signal before the long EMA starts)
+stocks['short_ema'] = align(cached_ema(prices, short_period), len(stocks))
+stocks['long_ema'] = align(cached_ema(prices, long_period), len(stocks))
+stocks['signal'] = pd.Series(align(signals, len(stocks)), index=stocks.index).fillna(0).astype(int)
 
 print(stocks)
 
@@ -124,8 +100,8 @@ def execute_trade(signal, symbol):
 
 # Iterate through signals and execute trades
 for i in range(len(stocks)):
-    if stocks['signal'][i] == 1 or stocks['signal'][i] == -1:
-        execute_trade(stocks['signal'][i], STOCK_SYMBOL)
+    if stocks['signal'].iloc[i] == 1 or stocks['signal'].iloc[i] == -1:
+        execute_trade(stocks['signal'].iloc[i], STOCK_SYMBOL)
         time.sleep(1)  # To avoid hitting the rate limit
 
 
@@ -140,21 +116,24 @@ fig, ax = plt.subplots()
 def update(frame):
     global stocks, API_KEY, STOCK_SYMBOL, INTERVAL
     data = fetch_data(STOCK_SYMBOL, INTERVAL, API_KEY)
-    stocks = parse_data(data)
+    stocks = merge_data(stocks, parse_data(data))
     prices = stocks['close'].to_numpy()
 
-    # Calculate EMAs and generate signals
-    short_ema, long_ema, signals = generate_signals(prices, short_period, long_period)
+    # Calculate EMAs and generate signals (the EMAs come out of the indicator cache)
+    short_ema = cached_ema(prices, short_period)
+    long_ema = cached_ema(prices, long_period)
+    signals = generate_signals(prices, short_period, long_period)
 
     # Clear the previous plot
     ax.clear()
 
-    # Plot the closing prices
-    ax.plot(stocks.index, stocks['close'], label='Close Price', color='blue')
+    # Plot the closing prices and EMAs, reduced to the width of the axes but keeping the signal bars
+    signal_bars = [len(stocks) - len(signals) + i for i, signal in enumerate(signals) if signal != 0]
+    plot_downsampled(ax, stocks.index, stocks['close'], keep=signal_bars, label='Close Price', color='blue')
 
     # Plot the EMAs
-    ax.plot(stocks.index[len(stocks) - len(short_ema):], short_ema, label=f'Short EMA ({short_period})', color='green')
-    ax.plot(stocks.index[len(stocks) - len(long_ema):], long_ema, label=f'Long EMA ({long_period})', color='red')
+    plot_downsampled(ax, stocks.index[len(stocks) - len(short_ema):], short_ema, label=f'Short EMA ({short_period})', color='green')
+    plot_downsampled(ax, stocks.index[len(stocks) - len(long_ema):], long_ema, label=f'Long EMA ({long_period})', color='red')
 
     # Plot buy/sell signals
     for i, signal in enumerate(signals):
@@ -169,6 +148,8 @@ def update(frame):
     ax.set_ylabel('Price')
     ax.legend()
 
+    print("Indicator cache:", indicator_cache.stats())
+
 # Create the animation
 ani = animation.FuncAnimation(fig, update, interval=300000)  # Update every 5 minutes (300000 ms)
 
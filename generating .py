@@ -1,41 +1,11 @@
 from datetime import datetime, timedelta
 import pandas as pd
-import random
+import numpy as np
 import schedule 
 import os
-
-# Initialize lists to store time and RSI values
-def append_to_csv(df, file_path):
-    mode = 'w' if not os.path.isfile(file_path) else 'a'
-    df.to_csv(file_path, mode=mode, header=mode=='w', index=False)
-    print("Data appended successfully to", file_path)
-
-# Function to generate stock data for 30 days (assuming 1 data point per minute)
-def generate_stock_data(symbol, start_price, num_minutes=30*24*60):
-    stock_data = []
-    current_price = start_price
-    start_time = datetime.now()
-
-    for i in range(num_minutes):  # 30 days of minute-by-minute data
-        open_price = current_price
-        high_price = open_price + random.uniform(0, 0.2)
-        low_price = open_price - random.uniform(0, 0.2)
-        close_price = random.uniform(low_price, high_price)
-        volume = random.randint(1, 10)
-        current_price = close_price
-
-        timestamp = start_time + timedelta(minutes=i)
-
-        stock_data.append({
-            'timestamp': timestamp,
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'volume': volume
-        })
-
-    return stock_data
+from market_data import append_to_csv, generate_stock_data, calculate_rsi
+from signal_engine import threshold, BUY
+from signal_log import SignalLog
 
 # Function to fetch RSI
 def fetch_rsi(stock_data):
@@ -43,17 +13,7 @@ def fetch_rsi(stock_data):
     data.set_index('timestamp', inplace=True)
 
     # Calculate RSI using pandas (example using close price)
-    delta = data['close'].diff()
-    gain = (delta.where(delta > 0, 0)).fillna(0)
-    loss = (-delta.where(delta < 0, 0)).fillna(0)
-
-    avg_gain = gain.rolling(window=14, min_periods=1).mean()
-    avg_loss = loss.rolling(window=14, min_periods=1).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-
-    return rsi
+    return calculate_rsi(data['close'])
 
 # Function to update the plot
 def update_plot(stocks, frame, close):
@@ -69,25 +29,17 @@ def update_plot(stocks, frame, close):
         # Use the latest RSI values
         rsi_values = rsi_values[-len(new_stock_df):]
         
-        buy_signals = []
-        sell_signals = []
-        for rsi in rsi_values:
-            if rsi < 30:
-                buy_signals.append('Buy')
-                sell_signals.append('None')
-            elif rsi > 70:
-                sell_signals.append('Sell')
-                buy_signals.append('None')
-            else:
-                buy_signals.append('None')
-                sell_signals.append('None')
+        # Buy below 30, sell above 70; strength is how far RSI is past the threshold
+        rsi = rsi_values.to_numpy()
+        sides = threshold(rsi, lower=30, upper=70)
+        strength = np.where(sides == BUY, 30 - rsi, rsi - 70)
 
-        # Update new_stock_df DataFrame with RSI values and buy/sell signals
-        new_stock_df['rsi'] = rsi_values.values
-        new_stock_df['buy_signals'] = buy_signals
-        new_stock_df['sell_signals'] = sell_signals
-        
-        append_to_csv(new_stock_df, "rsi_data.csv")
+        # Bars and RSI go to the data file, only the bars with a signal go to the event log
+        new_stock_df['rsi'] = rsi
+        signal_log.record(new_stock_df['timestamp'], sides, 'AAPL', 'rsi_14', strength)
+
+        # New file name: the buy/sell columns of the old rsi_data.csv moved to rsi_signals.csv
+        append_to_csv(new_stock_df, "rsi_bars.csv")
         
         # Update close price for the next iteration
        
@@ -96,6 +48,9 @@ def update_plot(stocks, frame, close):
     except Exception as e:
         print(f"Error fetching or plotting data: {e}")
 
+# Signal events for every bar where RSI is past a threshold
+signal_log = SignalLog("rsi_signals.csv")
+
 # Initialize close price
 global close
 close = 200
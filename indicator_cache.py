@@ -0,0 +1,143 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Memoization layer for indicator functions such as calculate_ema(prices, period).
+# Results are keyed by the indicator, its parameters and a hash of the price series,
+# and are evicted least-recently-used first once either the entry or byte limit is hit.
+class IndicatorCache:
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.extenders = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+
+    # An extender continues a cached result when only the tail of the series changed:
+    # extender(prices, *params, cached_prices=..., cached_result=..., common=...)
+    # returns the new result, or None to fall back to a full recompute.
+    def register_extender(self, func, extender):
+        self.extenders[func] = extender
+
+    def cached(self, func, extender=None):
+        if extender is not None:
+            self.register_extender(func, extender)
+
+        def wrapper(prices, *params):
+            return self.compute(func, prices, *params)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def compute(self, func, prices, *params):
+        series = np.ascontiguousarray(prices, dtype=np.float64)
+        key = (func, params, series_digest(series))
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy_result(entry[1])
+
+        self.misses += 1
+        result = None
+        extender = self.extenders.get(func)
+        if extender is not None:
+            source_key, common = self.find_prefix(func, params, series)
+            if source_key is not None:
+                cached_prices, cached_result = self.entries[source_key]
+                result = extender(prices, *params, cached_prices=cached_prices,
+                                  cached_result=cached_result, common=common)
+                if result is not None:
+                    # A strict extension supersedes the entry it was built from; a truncated
+                    # or diverging series may still be wanted by another caller
+                    if common == len(cached_prices):
+                        self.discard(source_key)
+                    self.extensions += 1
+
+        if result is None:
+            result = func(prices, *params)
+
+        self.store(key, series, result)
+        return copy_result(result)
+
+    # Find the cached series for the same indicator that shares the longest prefix
+    def find_prefix(self, func, params, series):
+        best_key = None
+        best_common = 0
+        for key, (cached_prices, _) in self.entries.items():
+            if key[0] is not func or key[1] != params:
+                continue
+            # Cheap check first: series of other symbols almost never share the first price
+            if not len(cached_prices) or not len(series) or cached_prices[0] != series[0]:
+                continue
+            common = common_prefix(cached_prices, series)
+            if common > best_common:
+                best_key = key
+                best_common = common
+        return best_key, best_common
+
+    def store(self, key, series, result):
+        nbytes = series.nbytes + result_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+        if isinstance(result, np.ndarray):
+            result.setflags(write=False)
+        self.entries[key] = (series, result)
+        self.size += nbytes
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            oldest = next(iter(self.entries))
+            self.discard(oldest)
+            self.evictions += 1
+
+    def discard(self, key):
+        series, result = self.entries.pop(key)
+        self.size -= series.nbytes + result_nbytes(result)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'extensions': self.extensions,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def series_digest(series):
+    return hashlib.blake2b(series.tobytes(), digest_size=16).digest()
+
+
+def common_prefix(a, b):
+    n = min(len(a), len(b))
+    mismatch = np.flatnonzero(a[:n] != b[:n])
+    return int(mismatch[0]) if mismatch.size else n
+
+
+def result_nbytes(result):
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, (list, tuple)):
+        return 8 * len(result)
+    return 0
+
+
+def copy_result(result):
+    # Lists are copied so callers cannot mutate the cached value; arrays are stored read-only
+    if isinstance(result, list):
+        return list(result)
+    return result
@@ -0,0 +1,152 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+# Helpers shared by the scripts (example.py, ema.py, obv.py, "generating .py") and supervisor.py.
+# The scripts run their scheduling loops at import time, so they cannot import each other.
+
+
+def append_to_csv(df, file_path, quiet=False):
+    mode = 'w' if not os.path.isfile(file_path) or os.path.getsize(file_path) == 0 else 'a'
+    if mode == 'a':
+        # Appending rows with a different column layout would misalign them under the old header
+        with open(file_path, newline='') as f:
+            header = f.readline().strip()
+        if header != ','.join(map(str, df.columns)):
+            raise ValueError(f"Columns of {file_path} do not match: {header} != {','.join(map(str, df.columns))}")
+    df.to_csv(file_path, mode=mode, header=mode=='w', index=False)
+    if not quiet:
+        print("Data appended successfully to", file_path)
+
+# Simulated minute bars (default 30 days) starting at `start_time` (default now)
+def generate_stock_data(symbol, start_price, num_minutes=30*24*60, start_time=None):
+    stock_data = []
+    current_price = start_price
+    start_time = start_time or datetime.now()
+
+    for i in range(num_minutes):
+        open_price = current_price
+        high_price = open_price + random.uniform(0, 0.2)
+        low_price = open_price - random.uniform(0, 0.2)
+        close_price = random.uniform(low_price, high_price)
+        volume = random.randint(1, 10)
+        current_price = close_price
+
+        timestamp = start_time + timedelta(minutes=i)
+
+        stock_data.append({
+            'timestamp': timestamp,
+            'open': round(open_price, 2),
+            'high': round(high_price, 2),
+            'low': round(low_price, 2),
+            'close': round(close_price, 2),
+            'volume': volume
+        })
+
+    return stock_data
+
+def calculate_rsi(close, period=14):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).fillna(0)
+    loss = (-delta.where(delta < 0, 0)).fillna(0)
+
+    avg_gain = gain.rolling(window=period, min_periods=1).mean()
+    avg_loss = loss.rolling(window=period, min_periods=1).mean()
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+# A process killed in the middle of append_to_csv leaves a last row without a newline.
+# Cut it off, so the file can be read and the next append starts on a fresh line.
+def drop_partial_line(file_path):
+    if not os.path.isfile(file_path):
+        return
+    with open(file_path, 'rb+') as f:
+        position = f.seek(0, os.SEEK_END)
+        if position == 0:
+            return
+        f.seek(position - 1)
+        if f.read(1) == b'\n':
+            return
+        while position > 0:
+            start = max(position - 65536, 0)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+# The last `rows` valid bars of a CSV written by append_to_csv, or None if there are none.
+# Rows that do not parse (wrong field count, missing timestamp or close) are skipped.
+def read_last_bars(file_path, rows):
+    drop_partial_line(file_path)
+    if not os.path.isfile(file_path) or os.path.getsize(file_path) == 0:
+        return None
+    bars = pd.read_csv(file_path, on_bad_lines='skip')
+    bars['timestamp'] = pd.to_datetime(bars['timestamp'], errors='coerce')
+    bars['close'] = pd.to_numeric(bars['close'], errors='coerce')
+    bars = bars.dropna(subset=['timestamp', 'close'])
+    if bars.empty:
+        return None
+    return bars.tail(rows).reset_index(drop=True)
+
+# EMA helpers shared by example.py, ema.py and the supervisor workers
+
+def detect_precision(value):
+    if isinstance(value, float):
+        decimal_part = str(value).split('.')[1]
+        return len(decimal_part)
+    return 0
+
+def round_float(value, precision):
+    return round(value, precision)
+
+def calculate_sma(prices, period):
+    if len(prices) < period:
+        raise ValueError("Not enough data points to calculate SMA")
+    sma = sum(prices) / period
+    return [sma]
+
+def calculate_ema(prices, period):
+    if len(prices) < 2 * period:
+        raise ValueError("Prices length must be at least twice the period")
+    
+    emas = []
+    round_precision = detect_precision(prices[0])
+    
+    # First EMA value = SMA value
+    sma = calculate_sma(prices[:period], period)
+    previous_ema = sma[0]
+    emas.append(round_float(previous_ema, round_precision))
+    
+    # Smoothing factor
+    alpha = 2 / (1 + period)
+    for p in prices[period:]:
+        previous_ema = emas[-1]
+        ema = (p * alpha) + (previous_ema * (1 - alpha))
+        emas.append(round_float(ema, round_precision))
+    
+    return emas
+
+# Continue a cached EMA when only the tail of the price series changed.
+# Only fires for append-only series (e.g. example.py's merge_data); otherwise the EMA is recomputed.
+def extend_ema(prices, period, cached_prices, cached_result, common):
+    if len(prices) < 2 * period or common < period:
+        return None
+
+    round_precision = detect_precision(prices[0])
+    alpha = 2 / (1 + period)
+
+    # emas[i] depends on prices[:period + i], so the first common - period + 1 values are still valid
+    emas = cached_result[:common - period + 1]
+    for p in prices[common:]:
+        previous_ema = emas[-1]
+        ema = (p * alpha) + (previous_ema * (1 - alpha))
+        emas.append(round_float(ema, round_precision))
+
+    return emas
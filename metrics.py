@@ -0,0 +1,147 @@
+import math
+
+import numpy as np
+
+
+# Streaming performance and risk metrics for a single-instrument backtest or live pipeline.
+#
+# Feed it the price and the position held (in shares) for each bar, either one bar at a
+# time with update() or a chunk at a time with update_batch(). Cash and equity are tracked
+# the same way backtest_strategy does it (cash pays for every change in position), and only
+# a fixed number of running totals is kept, so memory does not grow with the number of bars.
+# With float32=True chunks are converted to float32 before the vectorized maths, which
+# halves memory traffic for large sweeps; running totals are still kept as Python floats.
+class MetricsAccumulator:
+    def __init__(self, initial_capital=100000.0, periods_per_year=252, float32=False):
+        self.initial_capital = float(initial_capital)
+        self.periods_per_year = periods_per_year
+        self.dtype = np.float32 if float32 else np.float64
+
+        self.cash = self.initial_capital
+        self.position = 0.0
+        self.equity = self.initial_capital
+        self.bars = 0
+
+        # Welford running mean/variance of per-bar returns
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2 = 0.0
+
+        self.peak = self.initial_capital
+        self.max_drawdown = 0.0
+        self.traded_notional = 0.0
+        self.equity_sum = 0.0
+
+        self.trade_entry_equity = None
+        self.trades = 0
+        self.wins = 0
+
+    def update(self, price, position):
+        price = float(price)
+        position = float(position)
+        change = position - self.position
+        previous_equity = self.equity
+
+        self.cash -= change * price
+        self.traded_notional += abs(change) * price
+        self.equity = self.cash + position * price
+        self.equity_sum += self.equity
+        self.bars += 1
+
+        if previous_equity != 0:
+            self.add_return(self.equity / previous_equity - 1)
+
+        if self.equity > self.peak:
+            self.peak = self.equity
+        elif self.peak > 0:
+            self.max_drawdown = max(self.max_drawdown, 1 - self.equity / self.peak)
+
+        if change != 0:
+            self.record_trade(self.position, position, self.equity)
+        self.position = position
+
+    def update_batch(self, prices, positions):
+        prices = np.asarray(prices, dtype=self.dtype)
+        positions = np.asarray(positions, dtype=self.dtype)
+        if len(prices) == 0:
+            return
+
+        changes = np.diff(positions, prepend=self.dtype(self.position))
+        cash = self.cash - np.cumsum(changes * prices, dtype=np.float64)
+        equity = cash + positions * prices
+
+        previous_equity = np.concatenate(([self.equity], equity[:-1]))
+        valid = previous_equity != 0
+        returns = equity[valid] / previous_equity[valid] - 1
+        if len(returns):
+            self.merge_returns(len(returns), float(returns.mean()), float(((returns - returns.mean()) ** 2).sum()))
+
+        peaks = np.maximum.accumulate(np.concatenate(([self.peak], equity)))[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks > 0, 1 - equity / peaks, 0.0)
+        self.max_drawdown = max(self.max_drawdown, float(drawdowns.max()))
+        self.peak = float(peaks[-1])
+
+        self.traded_notional += float(np.abs(changes * prices).sum())
+        self.equity_sum += float(equity.sum())
+
+        # Trades are rare compared to bars, so only the bars where the position changes are visited
+        previous_positions = positions - changes
+        for i in np.flatnonzero(changes):
+            self.record_trade(float(previous_positions[i]), float(positions[i]), float(equity[i]))
+
+        self.cash = float(cash[-1])
+        self.position = float(positions[-1])
+        self.equity = float(equity[-1])
+        self.bars += len(prices)
+
+    def add_return(self, value):
+        self.n_returns += 1
+        delta = value - self.mean_return
+        self.mean_return += delta / self.n_returns
+        self.m2 += delta * (value - self.mean_return)
+
+    # Combine the running return statistics with those of a whole chunk (Chan et al.)
+    def merge_returns(self, n, mean, m2):
+        total = self.n_returns + n
+        delta = mean - self.mean_return
+        self.m2 += m2 + delta * delta * self.n_returns * n / total
+        self.mean_return += delta * n / total
+        self.n_returns = total
+
+    # A trade runs from leaving flat to returning to flat (or flipping side)
+    def record_trade(self, old_position, new_position, equity):
+        if old_position != 0 and (new_position == 0 or (old_position > 0) != (new_position > 0)):
+            self.trades += 1
+            if equity > self.trade_entry_equity:
+                self.wins += 1
+            self.trade_entry_equity = None
+        if new_position != 0 and self.trade_entry_equity is None:
+            self.trade_entry_equity = equity
+
+    def result(self):
+        std = math.sqrt(self.m2 / (self.n_returns - 1)) if self.n_returns > 1 else 0.0
+        mean_equity = self.equity_sum / self.bars if self.bars else self.initial_capital
+        return {
+            'bars': self.bars,
+            'final_equity': self.equity,
+            'total_return': self.equity / self.initial_capital - 1,
+            'sharpe': self.mean_return / std * math.sqrt(self.periods_per_year) if std > 0 else 0.0,
+            'max_drawdown': self.max_drawdown,
+            'turnover': self.traded_notional / mean_equity if mean_equity else 0.0,
+            'trades': self.trades,
+            'win_rate': self.wins / self.trades if self.trades else 0.0,
+        }
+
+
+# Metrics for a signal series (1 = long, 0 = flat) without building a portfolio DataFrame,
+# e.g. inside a parameter sweep or Monte Carlo run. The series is streamed in chunks.
+def backtest_metrics(close, signal, shares=100, initial_capital=100000.0, periods_per_year=252,
+                     float32=False, chunk_size=65536):
+    close = np.asarray(close)
+    signal = np.asarray(signal)
+    accumulator = MetricsAccumulator(initial_capital, periods_per_year, float32)
+    for start in range(0, len(close), chunk_size):
+        end = start + chunk_size
+        accumulator.update_batch(close[start:end], signal[start:end] * shares)
+    return accumulator.result()
@@ -0,0 +1,111 @@
+import numpy as np
+
+BUY = 1
+SELL = -1
+
+
+# Right-align an indicator (e.g. an EMA that starts `period - 1` bars late) to the bar count
+def align(values, n_bars):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) >= n_bars:
+        return values[len(values) - n_bars:]
+    out = np.full(n_bars, np.nan)
+    out[n_bars - len(values):] = values
+    return out
+
+
+# +1 where fast crosses above slow, -1 where it crosses below, 0 otherwise
+def crossover(fast, slow):
+    fast = np.asarray(fast, dtype=np.float64)
+    slow = np.asarray(slow, dtype=np.float64)
+    signals = np.zeros(len(fast), dtype=np.int8)
+    if len(fast) < 2:
+        return signals
+
+    above = fast > slow
+    below = fast < slow
+    was_above_or_equal = fast[:-1] >= slow[:-1]
+    was_below_or_equal = fast[:-1] <= slow[:-1]
+    signals[1:][above[1:] & was_below_or_equal] = BUY
+    signals[1:][below[1:] & was_above_or_equal] = SELL
+    return signals
+
+
+# +1 while values are below `lower` (e.g. RSI < 30), -1 while above `upper` (e.g. RSI > 70)
+def threshold(values, lower=None, upper=None):
+    values = np.asarray(values, dtype=np.float64)
+    signals = np.zeros(len(values), dtype=np.int8)
+    if lower is not None:
+        signals[values < lower] = BUY
+    if upper is not None:
+        signals[values > upper] = SELL
+    return signals
+
+
+# Signal only where every input agrees on the same side
+def combine_all(*signals):
+    stacked = np.vstack(signals)
+    first = stacked[0]
+    agree = (stacked == first).all(axis=0)
+    return np.where(agree, first, 0).astype(np.int8)
+
+
+# Signal where any input fires; conflicting sides on the same bar cancel out
+def combine_any(*signals):
+    stacked = np.vstack(signals)
+    buy = (stacked == BUY).any(axis=0)
+    sell = (stacked == SELL).any(axis=0)
+    out = np.zeros(stacked.shape[1], dtype=np.int8)
+    out[buy & ~sell] = BUY
+    out[sell & ~buy] = SELL
+    return out
+
+
+# Evaluate many strategy definitions against the same indicator arrays in one pass.
+#
+# Each strategy is a dict with an 'id' and a 'rule':
+#   {'id': 'ema_12_26', 'rule': 'crossover', 'fast': ('ema', 12), 'slow': ('ema', 26)}
+#   {'id': 'rsi_14', 'rule': 'threshold', 'input': ('rsi', 14), 'lower': 30, 'upper': 70}
+#   {'id': 'ema_and_rsi', 'rule': 'all', 'of': ['ema_12_26', 'rsi_14']}
+#   {'id': 'ema_or_rsi', 'rule': 'any', 'of': ['ema_12_26', 'rsi_14']}
+#
+# `indicator(name, param)` returns the indicator values (for example through an
+# IndicatorCache); each distinct (name, param) is requested once per call.
+# Returns the strategy ids and an int8 matrix with one row per strategy and one
+# column per bar.
+def evaluate_strategies(strategies, n_bars, indicator):
+    arrays = {}
+
+    def series(spec):
+        if spec not in arrays:
+            arrays[spec] = align(indicator(*spec), n_bars)
+        return arrays[spec]
+
+    # 'all'/'any' rules may only refer to strategies listed before them
+    defined = set()
+    for strategy in strategies:
+        for other in strategy.get('of', []):
+            if other not in defined:
+                raise ValueError(f"Strategy {strategy['id']!r} refers to unknown or later strategy {other!r}")
+        defined.add(strategy['id'])
+
+    ids = [strategy['id'] for strategy in strategies]
+    rows = {}
+    matrix = np.zeros((len(strategies), n_bars), dtype=np.int8)
+
+    for i, strategy in enumerate(strategies):
+        rule = strategy['rule']
+        if rule == 'crossover':
+            row = crossover(series(strategy['fast']), series(strategy['slow']))
+        elif rule == 'threshold':
+            row = threshold(series(strategy['input']), strategy.get('lower'), strategy.get('upper'))
+        elif rule == 'all':
+            row = combine_all(*[rows[other] for other in strategy['of']])
+        elif rule == 'any':
+            row = combine_any(*[rows[other] for other in strategy['of']])
+        else:
+            raise ValueError(f"Unknown strategy rule: {rule}")
+        rows[strategy['id']] = row
+        matrix[i] = row
+
+    return ids, matrix
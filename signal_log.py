@@ -0,0 +1,88 @@
+import csv
+import os
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['timestamp', 'symbol', 'strategy', 'side', 'strength']
+
+
+# Append-only store of signal events (timestamp, symbol, strategy id, side, strength).
+#
+# Only bars that actually produce a signal are written, instead of a dense buy/sell
+# column per bar. Events are appended to a CSV file and indexed in memory per symbol
+# by timestamp, so time-range lookups are a binary search. Bar data is only joined in
+# when asked for with join().
+class SignalLog:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.index = {}
+        if os.path.isfile(file_path):
+            with open(file_path, newline='') as f:
+                for row in csv.DictReader(f):
+                    self.add_to_index(pd.Timestamp(row['timestamp']), row['symbol'], row['strategy'],
+                                      int(row['side']), float(row['strength']))
+
+    def add_to_index(self, timestamp, symbol, strategy, side, strength):
+        timestamps, events = self.index.setdefault(symbol, ([], []))
+        # Events normally arrive in time order, so this is usually an append
+        position = bisect_right(timestamps, timestamp)
+        timestamps.insert(position, timestamp)
+        events.insert(position, (timestamp, symbol, strategy, side, strength))
+
+    def append(self, timestamp, symbol, strategy, side, strength=1.0):
+        self.extend([(timestamp, symbol, strategy, side, strength)])
+
+    def extend(self, events):
+        events = [(pd.Timestamp(timestamp), symbol, strategy, int(side), float(strength))
+                  for timestamp, symbol, strategy, side, strength in events]
+        if not events:
+            return
+
+        write_header = not os.path.isfile(self.file_path)
+        with open(self.file_path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(COLUMNS)
+            for event in events:
+                writer.writerow([event[0].isoformat(), *event[1:]])
+                self.add_to_index(*event)
+
+    # Log the non-zero entries of a dense signal array (1 = buy, -1 = sell), e.g. a row of
+    # the signal engine's matrix. `strength` may be a scalar or an array aligned with `sides`.
+    def record(self, timestamps, sides, symbol, strategy, strength=1.0):
+        sides = np.asarray(sides)
+        bars = np.flatnonzero(sides)
+        timestamps = np.asarray(timestamps)
+        strength = np.broadcast_to(np.asarray(strength, dtype=float), sides.shape)
+        self.extend((timestamps[i], symbol, strategy, sides[i], strength[i]) for i in bars)
+        return len(bars)
+
+    def query(self, symbol=None, start=None, end=None, strategy=None):
+        symbols = [symbol] if symbol is not None else sorted(self.index)
+        rows = []
+        for name in symbols:
+            timestamps, events = self.index.get(name, ([], []))
+            low = bisect_left(timestamps, pd.Timestamp(start)) if start is not None else 0
+            high = bisect_right(timestamps, pd.Timestamp(end)) if end is not None else len(timestamps)
+            rows.extend(event for event in events[low:high] if strategy is None or event[2] == strategy)
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+    # Attach the events of `symbol` to a bar DataFrame with a 'timestamp' column. Events are
+    # pivoted to '<strategy>_side' / '<strategy>_strength' columns, so the result keeps one
+    # row per bar even when several strategies fire on the same bar.
+    def join(self, bars, symbol, strategy=None):
+        bars = bars.copy()
+        bars['timestamp'] = pd.to_datetime(bars['timestamp'])
+        events = self.query(symbol, bars['timestamp'].min(), bars['timestamp'].max(), strategy)
+        if events.empty:
+            return bars
+
+        events = events.drop_duplicates(['timestamp', 'strategy'], keep='last')
+        events = events.pivot(index='timestamp', columns='strategy', values=['side', 'strength'])
+        events.columns = [f'{name}_{field}' for field, name in events.columns]
+        return bars.merge(events, left_on='timestamp', right_index=True, how='left')
+
+    def __len__(self):
+        return sum(len(timestamps) for timestamps, _ in self.index.values())
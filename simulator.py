@@ -53,6 +53,8 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from downsample import plot_downsampled
+from metrics import backtest_metrics
 
 # Fetch historical data
 def fetch_data(ticker, start_date, end_date):
@@ -71,7 +73,7 @@ def sma_crossover_strategy(data, short_window, long_window):
     signals['long_mavg'] = data['Close'].rolling(window=long_window, min_periods=1, center=False).mean()
 
     # Create signals
-    signals['signal'][short_window:] = np.where(signals['short_mavg'][short_window:] > signals['long_mavg'][short_window:], 1.0, 0.0)
+    signals.loc[signals.index[short_window:], 'signal'] = np.where(signals['short_mavg'].iloc[short_window:] > signals['long_mavg'].iloc[short_window:], 1.0, 0.0)
     signals['positions'] = signals['signal'].diff()
 
     return signals
@@ -100,10 +102,11 @@ portfolio = backtest_strategy(stock_data, signals)
 
 # Output results
 print(portfolio.tail())
+print(backtest_metrics(stock_data['Close'].to_numpy().ravel(), signals['signal'].to_numpy()))
 
-# Plot the results
-plt.figure(figsize=(14, 7))
-plt.plot(portfolio['total'], label='Portfolio value')
+# Plot the results, reduced to the width of the axes but keeping every trade
+fig, ax = plt.subplots(figsize=(14, 7))
+plot_downsampled(ax, portfolio.index, portfolio['total'], keep=signals['positions'].fillna(0).to_numpy() != 0, label='Portfolio value')
 plt.title('Portfolio Value Over Time')
 plt.xlabel('Date')
 plt.ylabel('Portfolio Value ($)')
@@ -175,7 +178,9 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import quandl
 from datetime import datetime, timedelta
+from collections import deque
 import pandas as pd
+from downsample import LiveDownsampler, axes_width
 
 # Replace with your Quandl API key
 QUANDL_API_KEY = 'your_quandl_api_key'
@@ -201,51 +206,42 @@ def fetch_rsi():
     # Return the latest RSI value and full RSI series
     return rsi.iloc[-1], rsi
 
-# Initialize lists to store time and RSI values
-times = []
-rsi_values = []
-buy_signals = []
-sell_signals = []
+# Only the bars where a signal starts are kept, as (time, rsi, side); the oldest are dropped past MAX_MARKERS
+MAX_MARKERS = 50
+signal_events = deque(maxlen=MAX_MARKERS)
+previous_signal = None
 
 # Function to update the plot
 def update_plot(frame):
-    current_time = datetime.now().strftime('%H:%M:%S')
+    global previous_signal
+    now = datetime.now()
+    current_time = now.strftime('%H:%M:%S')
     try:
         latest_rsi, full_rsi = fetch_rsi()
-        times.append(current_time)
-        rsi_values.append(latest_rsi)
         print(f"Fetched RSI: {latest_rsi} at {current_time}")
 
         # Determine buy/sell signals
         if latest_rsi < 30:
-            buy_signals.append((current_time, latest_rsi))
-            sell_signals.append((None, None))  # No signal
             signal = 'Buy'
         elif latest_rsi > 70:
-            sell_signals.append((current_time, latest_rsi))
-            buy_signals.append((None, None))  # No signal
             signal = 'Sell'
         else:
-            buy_signals.append((None, None))  # No signal
-            sell_signals.append((None, None))  # No signal
             signal = None
+        # RSI stays past a threshold for many bars in a row; only the first bar of each run is a marker
+        signal_starts = signal is not None and signal != previous_signal
+        previous_signal = signal
+        if signal_starts:
+            signal_events.append((now, latest_rsi, signal))
 
-        # Keep the last 60 data points for better visualization
-        if len(times) > 60:
-            times.pop(0)
-            rsi_values.pop(0)
-            buy_signals.pop(0)
-            sell_signals.pop(0)
+        # The whole history is kept, reduced to about the width of the axes; signal starts are never dropped
+        rsi_points.append(now, latest_rsi, keep=signal_starts)
+        times, rsi_values = rsi_points.points()
 
         # Clear and re-plot
         ax.clear()
         ax.plot(times, rsi_values, label='RSI')
-        for i, (time, rsi) in enumerate(buy_signals):
-            if time is not None:
-                ax.annotate('Buy', (time, rsi), textcoords="offset points", xytext=(0,10), ha='center', color='green')
-        for i, (time, rsi) in enumerate(sell_signals):
-            if time is not None:
-                ax.annotate('Sell', (time, rsi), textcoords="offset points", xytext=(0,10), ha='center', color='red')
+        for time, rsi, side in signal_events:
+            ax.annotate(side, (time, rsi), textcoords="offset points", xytext=(0,10), ha='center', color='green' if side == 'Buy' else 'red')
 
         plt.xticks(rotation=45, ha='right')
         plt.subplots_adjust(bottom=0.30)
@@ -262,6 +258,7 @@ def update_plot(frame):
 
 # Set up the plot
 fig, ax = plt.subplots()
+rsi_points = LiveDownsampler(axes_width(ax))
 ani = animation.FuncAnimation(fig, update_plot, interval=300000)  # 300000 ms = 5 minutes
 
 plt.show()
@@ -0,0 +1,329 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from multiprocessing.connection import Listener, Client, answer_challenge, deliver_challenge
+from multiprocessing import AuthenticationError
+
+import numpy as np
+import pandas as pd
+
+from indicator_cache import IndicatorCache
+from market_data import (append_to_csv, generate_stock_data, calculate_rsi, calculate_ema, extend_ema,
+                         read_last_bars, drop_partial_line)
+from signal_engine import evaluate_strategies
+from signal_log import SignalLog
+
+
+BAR_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+# Strategies every worker evaluates for each of its symbols, in one pass per cycle
+STRATEGIES = [
+    {'id': 'rsi_14', 'rule': 'threshold', 'input': ('rsi', 14), 'lower': 30, 'upper': 70},
+    {'id': 'ema_12_26', 'rule': 'crossover', 'fast': ('ema', 12), 'slow': ('ema', 26)},
+]
+
+
+# Generation, indicators and persistence for one symbol. Between `history` and
+# 2 * `history` bars are kept in memory, which is enough to warm up the indicators. When the symbol
+# already has persisted bars (e.g. it was moved from a worker that died), the pipeline
+# resumes from them: same last close, next timestamp and indicator warm-up.
+class SymbolPipeline:
+    def __init__(self, symbol, output_dir, start_price=200, history=500, persist=True,
+                 cache=None, strategies=STRATEGIES):
+        self.symbol = symbol
+        self.strategies = strategies
+        self.cached_ema = (cache or IndicatorCache()).cached(calculate_ema, extend_ema)
+        self.close = start_price
+        self.next_time = datetime.now()
+        self.history = history
+        self.bars = pd.DataFrame(columns=BAR_COLUMNS)
+        self.bars_path = os.path.join(output_dir, f'{symbol}.csv')
+        self.signal_log = None
+        if persist:
+            signals_path = os.path.join(output_dir, f'{symbol}_signals.csv')
+            drop_partial_line(signals_path)
+            self.signal_log = SignalLog(signals_path)
+
+        persisted = read_last_bars(self.bars_path, history) if persist else None
+        if persisted is not None:
+            self.bars = persisted[BAR_COLUMNS]
+            self.close = self.bars['close'].iloc[-1]
+            self.next_time = self.bars['timestamp'].iloc[-1].to_pydatetime() + timedelta(minutes=1)
+
+    def step(self, frame):
+        new_bars = pd.DataFrame(generate_stock_data(self.symbol, self.close, frame, self.next_time))
+        self.close = new_bars['close'].iloc[-1]
+        self.next_time = new_bars['timestamp'].iloc[-1] + timedelta(minutes=1)
+        bars = pd.concat([self.bars, new_bars], ignore_index=True) if len(self.bars) else new_bars
+        # Trimmed in blocks: between trims the close series only grows at the tail, so the
+        # cached EMAs are extended instead of recomputed
+        if len(bars) > 2 * self.history:
+            bars = bars.iloc[-self.history:]
+        self.bars = bars
+
+        close = bars['close'].to_numpy(dtype=float)
+        indicators = {}
+
+        def indicator(name, period):
+            if name == 'rsi':
+                values = calculate_rsi(pd.Series(close), period).to_numpy()
+            elif name == 'ema':
+                # No EMA until there are twice `period` bars (calculate_ema needs them)
+                values = self.cached_ema(close, period) if len(close) >= 2 * period else []
+            else:
+                raise ValueError(f"Unknown indicator: {name}")
+            indicators[(name, period)] = values
+            return values
+
+        ids, matrix = evaluate_strategies(self.strategies, len(close), indicator)
+        signals = matrix[:, -frame:]
+
+        if self.signal_log is not None:
+            rsi = indicators[('rsi', 14)] if ('rsi', 14) in indicators else indicator('rsi', 14)
+            new_bars['rsi'] = rsi[-frame:]
+            append_to_csv(new_bars, self.bars_path, quiet=True)
+            for strategy_id, row in zip(ids, signals):
+                self.signal_log.record(new_bars['timestamp'], row, self.symbol, strategy_id)
+
+        return int(np.count_nonzero(signals))
+
+
+# Worker process: runs the pipelines of its shard and reports back over an authenticated
+# connection until it has run `cycles` cycles or gets a 'stop' command.
+def run_worker(worker_id, symbols, address, authkey, commands, output_dir, frame, interval, cycles, persist):
+    # One indicator cache per worker, with room for every EMA of every symbol in the shard
+    cache = IndicatorCache(max_entries=max(64, 4 * len(symbols)))
+    pipelines = {symbol: SymbolPipeline(symbol, output_dir, persist=persist, cache=cache) for symbol in symbols}
+    with Client(address, authkey=authkey) as connection:
+        connection.send({'type': 'hello', 'worker': worker_id, 'pid': os.getpid()})
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            while True:
+                try:
+                    command = commands.get_nowait()
+                except queue.Empty:
+                    break
+                if command['type'] == 'stop':
+                    return
+
+            started = time.perf_counter()
+            signals = 0
+            for pipeline in pipelines.values():
+                signals += pipeline.step(frame)
+            connection.send({
+                'type': 'result',
+                'worker': worker_id,
+                'symbols': len(pipelines),
+                'bars': frame * len(pipelines),
+                'signals': signals,
+                'seconds': time.perf_counter() - started,
+            })
+            cycle += 1
+            if interval:
+                time.sleep(interval)
+        connection.send({'type': 'done', 'worker': worker_id})
+
+
+def shard(symbols, n_workers):
+    return [list(symbols[i::n_workers]) for i in range(n_workers)]
+
+
+# Shards a symbol universe across worker processes and collects their results.
+#
+# Workers report over a localhost multiprocessing connection that requires a random
+# per-supervisor authkey, so other local users cannot connect and have frames unpickled.
+#
+# Every frame a worker sends doubles as a heartbeat. A worker whose process has exited
+# or that has been silent for `heartbeat_timeout` seconds is terminated and replaced by
+# a new worker for the same shard, so the pool stays at `n_workers` processes. The new
+# worker resumes each symbol from its persisted bars and runs only the remaining cycles.
+# Replacements are delayed by `restart_delay` seconds, doubling with every failure in a
+# row (up to `max_restart_delay`). After `max_failures` failures in a row without a single
+# result, the shard is given up and listed in `failed_shards`.
+class Supervisor:
+    def __init__(self, symbols, n_workers, output_dir='.', frame=5, interval=60, cycles=None,
+                 heartbeat_timeout=None, persist=True, restart_delay=1, max_restart_delay=60,
+                 max_failures=5):
+        self.symbols = list(symbols)
+        self.n_workers = n_workers
+        self.output_dir = output_dir
+        self.frame = frame
+        self.interval = interval
+        self.cycles = cycles
+        self.heartbeat_timeout = heartbeat_timeout or max(3 * interval, 10)
+        self.persist = persist
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.max_failures = max_failures
+
+        self.workers = {}
+        self.failures = {}
+        self.pending_restarts = []
+        self.failed_shards = []
+        self.results = queue.Queue()
+        self.next_worker_id = 0
+        self.bars = 0
+        self.signals = 0
+        self.replacements = 0
+
+    def start(self):
+        if self.persist:
+            os.makedirs(self.output_dir, exist_ok=True)
+        self.authkey = os.urandom(32)
+        # Authentication happens per connection in read_frames, so a client that never
+        # answers the challenge only blocks its own thread, not accept()
+        self.listener = Listener(('localhost', 0))
+        self.address = self.listener.address
+        threading.Thread(target=self.accept_connections, daemon=True).start()
+
+        for symbols in shard(self.symbols, self.n_workers):
+            self.start_worker(symbols)
+
+    def start_worker(self, symbols, cycles=None):
+        worker_id = self.next_worker_id
+        self.next_worker_id += 1
+        cycles = self.cycles if cycles is None else cycles
+        commands = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(worker_id, symbols, self.address, self.authkey, commands, self.output_dir,
+                  self.frame, self.interval, cycles, self.persist),
+            daemon=True,
+        )
+        process.start()
+        self.workers[worker_id] = {
+            'process': process,
+            'commands': commands,
+            'symbols': list(symbols),
+            'cycles': cycles,
+            'cycles_done': 0,
+            'last_seen': time.monotonic(),
+            'done': False,
+        }
+        return worker_id
+
+    def accept_connections(self):
+        while True:
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.read_frames, args=(connection,), daemon=True).start()
+
+    def read_frames(self, connection):
+        with connection:
+            try:
+                deliver_challenge(connection, self.authkey)
+                answer_challenge(connection, self.authkey)
+            except (AuthenticationError, EOFError, OSError):
+                return
+            while True:
+                try:
+                    self.results.put(connection.recv())
+                except (EOFError, OSError):
+                    return
+
+    def poll(self, timeout=0.1):
+        try:
+            message = self.results.get(timeout=timeout)
+        except queue.Empty:
+            message = None
+
+        while message is not None:
+            worker = self.workers.get(message['worker'])
+            if worker is not None:
+                worker['last_seen'] = time.monotonic()
+                if message['type'] == 'result':
+                    worker['cycles_done'] += 1
+                    self.failures[tuple(worker['symbols'])] = 0
+                    self.bars += message['bars']
+                    self.signals += message['signals']
+                elif message['type'] == 'done':
+                    worker['done'] = True
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                message = None
+
+        self.check_health()
+
+    def check_health(self):
+        now = time.monotonic()
+        for worker_id, worker in list(self.workers.items()):
+            # A clean exit means the worker finished its cycles, even if its 'done' frame is still in flight
+            if worker['done'] or worker['process'].exitcode == 0:
+                worker['done'] = True
+                continue
+            alive = worker['process'].is_alive()
+            if alive and now - worker['last_seen'] < self.heartbeat_timeout:
+                continue
+            if alive:
+                worker['process'].terminate()
+            worker['process'].join(timeout=5)
+            del self.workers[worker_id]
+            self.replace(worker_id, worker)
+
+        for restart in [restart for restart in self.pending_restarts if restart[0] <= now]:
+            self.pending_restarts.remove(restart)
+            _, symbols, cycles = restart
+            self.start_worker(symbols, cycles)
+            self.replacements += 1
+
+    # Schedule a new worker for a dead worker's shard, so the pool keeps `n_workers` processes
+    def replace(self, worker_id, worker):
+        remaining = None if worker['cycles'] is None else worker['cycles'] - worker['cycles_done']
+        if remaining is not None and remaining <= 0:
+            return
+
+        shard = tuple(worker['symbols'])
+        failures = self.failures.get(shard, 0) + 1
+        self.failures[shard] = failures
+        if failures >= self.max_failures:
+            self.failed_shards.append(list(shard))
+            print(f"Worker {worker_id} failed {failures} times in a row, giving up on symbols {', '.join(shard)}")
+            return
+
+        delay = min(self.restart_delay * 2 ** (failures - 1), self.max_restart_delay)
+        self.pending_restarts.append((time.monotonic() + delay, worker['symbols'], remaining))
+        print(f"Worker {worker_id} is unhealthy, restarting its {len(shard)} symbols in {delay:g}s")
+
+    def run(self, duration=None):
+        deadline = time.monotonic() + duration if duration else None
+        while self.pending_restarts or not all(worker['done'] for worker in self.workers.values()):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            self.poll()
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker['commands'].put({'type': 'stop'})
+        for worker in self.workers.values():
+            worker['process'].join(timeout=5)
+            if worker['process'].is_alive():
+                worker['process'].terminate()
+        self.listener.close()
+
+
+# Throughput (bars per second) for an increasing number of workers on the same universe
+def benchmark(n_symbols=64, worker_counts=None, cycles=20, frame=60):
+    worker_counts = worker_counts or sorted({1, 2, 4, os.cpu_count() or 1})
+    symbols = [f'SYM{i:03d}' for i in range(n_symbols)]
+    baseline = None
+    for n_workers in worker_counts:
+        supervisor = Supervisor(symbols, n_workers, frame=frame, interval=0, cycles=cycles, persist=False)
+        started = time.perf_counter()
+        supervisor.start()
+        supervisor.run()
+        elapsed = time.perf_counter() - started
+        supervisor.stop()
+
+        throughput = supervisor.bars / elapsed
+        baseline = baseline or throughput
+        print(f"{n_workers:3d} workers: {throughput:12.0f} bars/s  speedup {throughput / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark()